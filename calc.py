@@ -0,0 +1,452 @@
+"""Equity share calculator: input parsing, cost/revenue model and formatting.
+
+Kept free of Flask so it can be AOT-compiled on its own (``mypyc calc.py``);
+app.py imports the compiled module transparently when the extension is built.
+"""
+from calendar import isleap
+from datetime import date
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Mapping, Optional, overload
+
+# Days per month in a non-leap year (February is adjusted in add_months)
+_MDAYS = (31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+
+# --------- Helpers ---------
+@lru_cache(maxsize=2048)
+def _parse_date_str(s: str) -> Optional[date]:
+    """Parse a YYYY-MM-DD string; None if invalid. Memoized, dates are immutable."""
+    try:
+        return date.fromisoformat(s)
+    except (TypeError, ValueError):
+        return None
+
+@overload
+def parse_date(s: Optional[str], default: date) -> date: ...
+@overload
+def parse_date(s: Optional[str], default: None = None) -> Optional[date]: ...
+def parse_date(s: Optional[str], default: Optional[date] = None) -> Optional[date]:
+    """Parse YYYY-MM-DD string to date; return default if empty/invalid."""
+    if not s:
+        return default
+    parsed = _parse_date_str(s)
+    return parsed if parsed is not None else default
+
+def parse_float(s: object, default: float = 0.0) -> float:
+    """Parse string to float; accept both comma and dot decimals."""
+    if s is None or str(s).strip() == "":
+        return default
+    try:
+        return float(str(s).replace(",", ".").strip())
+    except Exception:
+        return default
+
+def days_inclusive(start: Optional[date], end: Optional[date]) -> int:
+    """Inclusive day count from start to end; 0 if end < start."""
+    if start is None or end is None:
+        return 0
+    # Ordinal subtraction avoids allocating a timedelta just to read .days
+    days = end.toordinal() - start.toordinal()
+    return days + 1 if days >= 0 else 0
+
+def add_months(d: date, months: int) -> date:
+    """Add months to a date (keeping day when possible; snaps to last valid day)."""
+    y = d.year + (d.month - 1 + months) // 12
+    m = (d.month - 1 + months) % 12 + 1
+    # Handle end-of-month
+    day = min(d.day, 29 if (m == 2 and isleap(y)) else _MDAYS[m - 1])
+    return date(y, m, day)
+
+def _fmt_date(d: date) -> str:
+    """Display format for dates in component labels, e.g. 01 Sep 2024."""
+    return d.strftime("%d %b %Y")
+
+# Swap thousands/decimal separators to the European style in a single pass
+_EUR_TRANS = str.maketrans(",.", ".,")
+
+def eur(x: float) -> str:
+    return "€" + format(x, ",.2f").translate(_EUR_TRANS)
+
+# --------- RIV helpers ---------
+# Module-level so calculate() doesn't rebuild them as closures on every call.
+def riv_component(start_dt: Optional[date], annual_revenue: float,
+                  proj_start: date, proj_end: date, projection_months: int) -> float:
+    """Recurring revenue pro-rated by active days within [proj_start, proj_end)."""
+    if start_dt is None or projection_months <= 0:
+        return 0.0
+    if start_dt >= proj_end:
+        return 0.0
+    active_start = max(start_dt, proj_start)
+    active_days = proj_end.toordinal() - active_start.toordinal()
+    if active_days <= 0:
+        return 0.0
+    daily_revenue = annual_revenue / 365.25
+    return daily_revenue * active_days
+
+def riv_onetime_component(event_date: Optional[date], amount: float,
+                          proj_start: date, proj_end: date, projection_months: int) -> float:
+    """One-off revenue, counted only if it falls inside [proj_start, proj_end)."""
+    if event_date is None or projection_months <= 0:
+        return 0.0
+    if not (proj_start <= event_date < proj_end):
+        return 0.0
+    return max(0.0, amount)
+
+# --------- Defaults ---------
+# join_date defaults to today and is filled in by default_params().
+BASE_DEFAULTS = MappingProxyType({
+    "you_name": "Hawkar Abdulhaq",
+    "partner_name": "Mariwan Masoud",
+    "pool_name": "Open Pool",
+    "you_pct": "40",
+    "partner_pct": "40",
+    "pool_pct": "20",
+    "calc_start": "2024-09-01",
+    "projection_start": "2026-01-01",
+    "projection_months": "24",
+    "director_start": "2025-01-01",
+    "past_cash_total": "4000",
+    "portal_val": "6000",
+    "finance_val": "5000",
+    "website_val": "2000",
+    "monthly_ops": "500",
+    "legal_fee": "2500",
+    "legal_fee_date": "2026-01-15",
+    "director_salary_year": "56000",
+    "riv_bootcamp_start": "2026-02-01",
+    "riv_bootcamp_per_year": "4",
+    "riv_bootcamp_amount": "7000",
+    "riv_coaching_start": "2026-01-15",
+    "riv_coaching_per_year": "20",
+    "riv_coaching_amount": "900",
+    "riv_llm_start": "2026-03-01",
+    "riv_llm_clients": "5",
+    "riv_llm_monthly": "300",
+    "riv_system_sale_date": "2026-06-01",
+    "riv_system_sale_amount": "25000"
+})
+
+# Every form field read by calculate()
+PARAM_KEYS = tuple(BASE_DEFAULTS) + ("join_date",)
+
+@lru_cache(maxsize=8)
+def _default_params(today_ordinal: int) -> Mapping[str, str]:
+    # Built once per day and shared by every request, so hand out a read-only view
+    join_date = date.fromordinal(today_ordinal).isoformat()
+    return MappingProxyType({**BASE_DEFAULTS, "join_date": join_date})
+
+def default_params(today: Optional[date] = None) -> Mapping[str, str]:
+    """Form defaults for today; rebuilt once per day."""
+    return _default_params((today or date.today()).toordinal())
+
+# --------- Core calculator ---------
+def calculate(params: Mapping[str, str], today: Optional[date] = None) -> dict:
+    """Raw (unformatted) results for a set of form values.
+
+    Kept as the module's numeric API and not cached; the page goes through
+    calculate_display(), which caches the formatted output. `today` defaults
+    to date.today().
+    """
+    return _calculate(_params_key(params), (today or date.today()).toordinal())
+
+def _params_key(params: Mapping[str, str]) -> frozenset:
+    return frozenset((k, params.get(k, "")) for k in PARAM_KEYS)
+
+def _calculate(items: frozenset, today_ordinal: int) -> dict:
+    params = dict(items)
+    today = date.fromordinal(today_ordinal)
+
+    def name_or(value: Optional[str], fallback: str) -> str:
+        value = (value or "").strip()
+        return value if value else fallback
+
+    # Equity & names
+    you_name = name_or(params.get("you_name"), "Hawkar Abdulhaq")
+    partner_name = name_or(params.get("partner_name"), "Mariwan Masoud")
+    pool_name = name_or(params.get("pool_name"), "Open Pool")
+
+    raw_shares = [
+        ("you", you_name, max(0.0, parse_float(params.get("you_pct"), 40.0))),
+        ("partner", partner_name, max(0.0, parse_float(params.get("partner_pct"), 40.0))),
+        ("pool", pool_name, max(0.0, parse_float(params.get("pool_pct"), 20.0))),
+    ]
+    share_total = sum(item[2] for item in raw_shares)
+    if share_total <= 0:
+        raw_shares = [
+            ("you", you_name, 40.0),
+            ("partner", partner_name, 40.0),
+            ("pool", pool_name, 20.0),
+        ]
+        share_total = 100.0
+
+    shares: dict[str, dict] = {}
+    share_order: list[str] = []
+    for key, label, pct in raw_shares:
+        share_order.append(key)
+        shares[key] = {"name": label, "pct": pct / share_total}
+
+    partner_pct = shares["partner"]["pct"]
+
+    # Key dates
+    calc_start = parse_date(params.get("calc_start"), date(2024, 9, 1))
+    join_date = parse_date(params.get("join_date"), today)
+    projection_start = parse_date(params.get("projection_start"), date(2026, 1, 1))
+    projection_months = int(parse_float(params.get("projection_months", "24"), 24.0))
+
+    director_start = parse_date(params.get("director_start"), date(2025, 1, 1))
+
+    # Amounts
+    past_cash_total = parse_float(params.get("past_cash_total"), 0.0)
+    portal_val = parse_float(params.get("portal_val"), 0.0)
+    finance_val = parse_float(params.get("finance_val"), 0.0)
+    website_val = parse_float(params.get("website_val"), 0.0)
+    monthly_ops = parse_float(params.get("monthly_ops"), 0.0)
+    legal_fee = parse_float(params.get("legal_fee"), 0.0)
+    legal_fee_date = parse_date(params.get("legal_fee_date"), date(2026, 1, 1))
+    director_salary_year = parse_float(params.get("director_salary_year"), 56000.0)
+
+    # RIV projections (revenues)
+    bootcamp_start = parse_date(params.get("riv_bootcamp_start"), projection_start)
+    bootcamp_per_year = parse_float(params.get("riv_bootcamp_per_year"), 4.0)
+    bootcamp_amount = parse_float(params.get("riv_bootcamp_amount"), 7000.0)
+
+    coaching_start = parse_date(params.get("riv_coaching_start"), projection_start)
+    coaching_per_year = parse_float(params.get("riv_coaching_per_year"), 12.0)
+    coaching_amount = parse_float(params.get("riv_coaching_amount"), 900.0)
+
+    llm_start = parse_date(params.get("riv_llm_start"), projection_start)
+    llm_clients = parse_float(params.get("riv_llm_clients"), 1.0)
+    llm_monthly = parse_float(params.get("riv_llm_monthly"), 300.0)
+
+    system_sale_date = parse_date(params.get("riv_system_sale_date"), None)
+    system_sale_amount = parse_float(params.get("riv_system_sale_amount"), 0.0)
+
+    # Defensive: if join_date before calc_start, swap logic for past period (no negative)
+    past_period_days = days_inclusive(calc_start, join_date)
+
+    # Per-day costs (use per-day based on yearly equivalents)
+    # monthly_ops per day ≈ monthly * 12 / 365.25
+    per_day_ops: float = monthly_ops * 12.0 / 365.25
+    past_ops_cost = per_day_ops * past_period_days
+
+    # Director time from director_start to join_date
+    director_active_start = max(director_start, calc_start)
+    director_days_past = days_inclusive(director_active_start, join_date)
+    per_day_director: float = director_salary_year / 365.25
+    past_director_cost = per_day_director * director_days_past
+
+    # Legal fee: count in "past" only if fee date <= join_date
+    past_legal = legal_fee if (legal_fee_date is not None and legal_fee_date <= join_date) else 0.0
+
+    # Past assets valuation (portal + finance + website)
+    assets_total = portal_val + finance_val + website_val
+
+    # Past totals
+    past_total_company = past_cash_total + assets_total + past_ops_cost + past_director_cost + past_legal
+    past_total_friend = past_total_company * partner_pct
+
+    # --- Projection ---
+    proj_start = projection_start
+    proj_end = add_months(proj_start, projection_months)
+    # Same per-day rates as the past period. The whole projection (costs, legal
+    # fee, RIV) uses the half-open window [proj_start, proj_end), so N months is
+    # exactly N calendar months of days, not N months plus one day.
+    # Negative months give a negative count, matching the old monthly * months.
+    proj_days = proj_end.toordinal() - proj_start.toordinal()
+    proj_ops_cost = per_day_ops * proj_days
+    proj_director_cost = per_day_director * proj_days
+    # Legal fee: count in projection if fee date in [proj_start, proj_end)
+    proj_legal = 0.0
+    if legal_fee_date is not None and proj_start <= legal_fee_date < proj_end:
+        proj_legal = legal_fee
+
+    proj_total_company = proj_ops_cost + proj_director_cost + proj_legal
+    proj_total_friend = proj_total_company * partner_pct
+    proj_avg_month_friend = proj_total_friend / projection_months if projection_months > 0 else 0.0
+
+    # Detailed components for display
+    join_label = _fmt_date(join_date)
+    past_components = {
+        "Past cash (you paid)": past_cash_total,
+        "Assets valuation (portal + finance + website)": assets_total,
+        f"Ops (from {_fmt_date(calc_start)} to {join_label})": past_ops_cost,
+        f"Director time (from {_fmt_date(director_active_start)} to {join_label})": past_director_cost,
+        "Legal fee (<= join date)": past_legal
+    }
+    proj_components = {
+        f"Ops ({projection_months} months)": proj_ops_cost,
+        f"Director time ({projection_months} months)": proj_director_cost,
+        "Legal fee within projection window": proj_legal
+    }
+
+    # --- RIV revenue projection ---
+    bootcamp_label = f"Bootcamps ({bootcamp_per_year:.0f}/yr from {_fmt_date(bootcamp_start)})"
+    coaching_label = f"1:1 sessions ({coaching_per_year:.0f}/yr from {_fmt_date(coaching_start)})"
+    llm_label = (
+        f"LLM analysis subscriptions ({llm_clients:.0f} clients × €{llm_monthly:.0f}/mo"
+        f" from {_fmt_date(llm_start)})"
+    )
+    if system_sale_date:
+        system_sale_label = f"System sale (one-off €{system_sale_amount:.0f} on {_fmt_date(system_sale_date)})"
+    else:
+        system_sale_label = f"System sale (one-off €{system_sale_amount:.0f})"
+
+    window = (proj_start, proj_end, projection_months)
+    bootcamp_revenue = riv_component(bootcamp_start, bootcamp_per_year * bootcamp_amount, *window)
+    coaching_revenue = riv_component(coaching_start, coaching_per_year * coaching_amount, *window)
+    llm_revenue = riv_component(llm_start, llm_clients * llm_monthly * 12.0, *window)
+    system_sale_revenue = riv_onetime_component(system_sale_date, system_sale_amount, *window)
+
+    riv_total_company = bootcamp_revenue + coaching_revenue + llm_revenue + system_sale_revenue
+    riv_components = {
+        bootcamp_label: bootcamp_revenue,
+        coaching_label: coaching_revenue,
+        llm_label: llm_revenue,
+        system_sale_label: system_sale_revenue
+    }
+    riv_total_friend = riv_total_company * partner_pct
+
+    return {
+        "inputs": {
+            "shares": shares,
+            "share_order": share_order,
+            "calc_start": calc_start.isoformat(),
+            "join_date": join_date.isoformat(),
+            "projection_start": proj_start.isoformat(),
+            "projection_months": projection_months,
+            "director_start": director_start.isoformat(),
+            "past_cash_total": past_cash_total,
+            "assets": {
+                "portal_val": portal_val,
+                "finance_val": finance_val,
+                "website_val": website_val
+            },
+            "monthly_ops": monthly_ops,
+            "legal_fee": legal_fee,
+            "legal_fee_date": legal_fee_date.isoformat() if legal_fee_date else None,
+            "director_salary_year": director_salary_year,
+            "riv": {
+                "bootcamp_start": bootcamp_start.isoformat() if bootcamp_start else None,
+                "bootcamp_per_year": bootcamp_per_year,
+                "bootcamp_amount": bootcamp_amount,
+                "coaching_start": coaching_start.isoformat() if coaching_start else None,
+                "coaching_per_year": coaching_per_year,
+                "coaching_amount": coaching_amount,
+                "llm_start": llm_start.isoformat() if llm_start else None,
+                "llm_clients": llm_clients,
+                "llm_monthly": llm_monthly,
+                "system_sale_date": system_sale_date.isoformat() if system_sale_date else None,
+                "system_sale_amount": system_sale_amount
+            }
+        },
+        "past": {
+            "components": past_components,
+            "company_total": past_total_company,
+            "friend_total": past_total_friend
+        },
+        "projection": {
+            "components": proj_components,
+            "company_total": proj_total_company,
+            "friend_total": proj_total_friend,
+            "friend_avg_month": proj_avg_month_friend,
+            "window": {
+                "start": proj_start.isoformat(),
+                "end": proj_end.isoformat()
+            },
+            "riv": {
+                "components": riv_components,
+                "company_total": riv_total_company,
+                "friend_total": riv_total_friend
+            }
+        },
+        "summary": {
+            "friend_due_to_join": past_total_friend,
+            "friend_future_{}m".format(projection_months): proj_total_friend,
+            "friend_total_all": past_total_friend + proj_total_friend,
+            "friend_riv_projection": riv_total_friend,
+            "friend_net_after_riv": past_total_friend + proj_total_friend - riv_total_friend,
+            "projection_company_revenue": riv_total_company,
+            "projection_share_rows": [
+                {
+                    "key": key,
+                    "name": shares[key]["name"],
+                    "pct": shares[key]["pct"],
+                    "revenue": riv_total_company * shares[key]["pct"],
+                    "cost": proj_total_company * shares[key]["pct"],
+                    "net": riv_total_company * shares[key]["pct"] - proj_total_company * shares[key]["pct"],
+                }
+                for key in share_order
+            ]
+        }
+    }
+
+# --------- Display ---------
+def _fmt_components(d: Mapping[str, float]) -> list[tuple[str, str]]:
+    return [(k, eur(v)) for k, v in d.items()]
+
+def _build_display(results: dict) -> dict:
+    """Pre-format a calculate() result for the template."""
+    return {
+        "inputs": results["inputs"],
+        "share_info": {
+            key: {
+                "name": data["name"],
+                "pct": f"{data['pct'] * 100:.1f}"
+            }
+            for key, data in results["inputs"]["shares"].items()
+        },
+        "past_components": _fmt_components(results["past"]["components"]),
+        "past_company_total": eur(results["past"]["company_total"]),
+        "past_friend_total": eur(results["past"]["friend_total"]),
+        "proj_components": _fmt_components(results["projection"]["components"]),
+        "proj_company_total": eur(results["projection"]["company_total"]),
+        "proj_friend_total": eur(results["projection"]["friend_total"]),
+        "proj_friend_avg_month": eur(results["projection"]["friend_avg_month"]),
+        "proj_window": results["projection"]["window"],
+        "riv_components": _fmt_components(results["projection"]["riv"]["components"]),
+        "riv_company_total": eur(results["projection"]["riv"]["company_total"]),
+        "riv_friend_total": eur(results["projection"]["riv"]["friend_total"]),
+        "summary_friend_due_to_join": eur(results["summary"]["friend_due_to_join"]),
+        "summary_friend_future": eur(results["summary"]["friend_future_{}m".format(results['inputs']['projection_months'])]),
+        "summary_friend_total_all": eur(results["summary"]["friend_total_all"]),
+        "summary_friend_riv": eur(results["summary"]["friend_riv_projection"]),
+        "summary_friend_net": eur(results["summary"]["friend_net_after_riv"]),
+        "summary_friend_net_value": results["summary"]["friend_net_after_riv"],
+        "projection_company_revenue": eur(results["summary"]["projection_company_revenue"]),
+        "projection_company_cost": eur(results["projection"]["company_total"]),
+        "projection_company_net": eur(results["summary"]["projection_company_revenue"] - results["projection"]["company_total"]),
+        "projection_company_net_value": results["summary"]["projection_company_revenue"] - results["projection"]["company_total"],
+        "summary_projection_rows": [
+            {
+                "key": row["key"],
+                "name": row["name"],
+                "pct": f"{row['pct'] * 100:.1f}%",
+                "revenue": eur(row["revenue"]),
+                "cost": eur(row["cost"]),
+                "net": eur(row["net"]),
+                "net_value": row["net"],
+            }
+            for row in results["summary"]["projection_share_rows"]
+        ]
+    }
+
+def calculate_display(params: Mapping[str, str], today: Optional[date] = None) -> dict:
+    """calculate() with values already formatted for the page.
+
+    Identical inputs on the same day reuse the previous result; the returned
+    dict is shared between callers and must not be mutated.
+    """
+    # today's ordinal is part of the key because an empty join_date falls back to today
+    return _display_cached(_params_key(params), (today or date.today()).toordinal())
+
+@lru_cache(maxsize=512)
+def _display_cached(items: frozenset, today_ordinal: int) -> dict:
+    return _build_display(_calculate(items, today_ordinal))
+
+@lru_cache(maxsize=8)
+def _default_display(today_ordinal: int) -> dict:
+    return _build_display(_calculate(_params_key(_default_params(today_ordinal)), today_ordinal))
+
+def default_display(today: Optional[date] = None) -> dict:
+    """Formatted results for the untouched form (GET); built once per day."""
+    return _default_display((today or date.today()).toordinal())
@@ -0,0 +1,8 @@
+"""Production entrypoint.
+
+    gunicorn -w 4 --threads 2 -b 0.0.0.0:5000 wsgi:app
+
+The calculation is CPU-bound and shares no state across processes. Each worker
+keeps its own LRU caches, warmed at import, so throughput scales with workers.
+"""
+from app import app